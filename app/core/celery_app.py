@@ -0,0 +1,28 @@
+from celery import Celery
+
+from app.core.config import settings
+
+
+celery_app = Celery(
+    "news_analyzer",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.tasks.celery_vectorization_task"]
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_routes={
+        "app.tasks.celery_vectorization_task.*": {"queue": settings.CELERY_VECTORIZATION_QUEUE}
+    },
+    # Embedding is model-bound: take one batch at a time and only ack it once it is done,
+    # so a crashed worker hands its batch back to the broker instead of losing it.
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    task_always_eager=settings.CELERY_ALWAYS_EAGER,
+    task_eager_propagates=False,
+    result_expires=24 * 60 * 60
+)
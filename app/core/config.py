@@ -25,6 +25,30 @@ class Settings(BaseSettings):
 
     CELERY_BROKER_URL: str = Field(..., env="CELERY_BROKER_URL")
     CELERY_RESULT_BACKEND: str = Field(..., env="CELERY_RESULT_BACKEND")
+    # run tasks inline in the producer (use with CELERY_BROKER_URL=memory:// for local runs)
+    CELERY_ALWAYS_EAGER: bool = Field(False, env="CELERY_ALWAYS_EAGER")
+    CELERY_VECTORIZATION_QUEUE: str = "vectorization"
+    CELERY_VECTORIZATION_RATE_LIMIT: str = Field("30/m", env="CELERY_VECTORIZATION_RATE_LIMIT")
+    CELERY_MAX_RETRIES: int = 3
+    CELERY_RETRY_BACKOFF: int = 10  # seconds, doubled on every retry
+    # times a batch may be handed out without finishing (e.g. the worker was OOM-killed)
+    # before each of its documents is charged a failed attempt
+    CELERY_MAX_DELIVERIES: int = 3
+    # batches the producer enqueues per poll, and how long a queued batch may sit before it is re-enqueued
+    CELERY_PRODUCER_BATCHES: int = 10
+    CELERY_QUEUED_TIMEOUT: int = 3600
+    DEAD_LETTER_COLLECTION: str = "vectorization_dead_letter"
+
+    # per-domain/per-day counters maintained by the vectorization worker
+    STATS_COLLECTION: str = "corpus_stats"
+
+    # lexical near-duplicate prefilter run before the sentence transformer
+    NEAR_DUP_ENABLED: bool = Field(True, env="NEAR_DUP_ENABLED")
+    NEAR_DUP_COLLECTION: str = "near_duplicate_index"
+    NEAR_DUP_WINDOW: int = 3 * 24 * 60 * 60  # seconds an article stays eligible as a canonical copy
+    NEAR_DUP_MAX_DISTANCE: int = 3  # max differing SimHash bits out of 64
+    NEAR_DUP_MIN_TOKENS: int = 30
+    NEAR_DUP_SHINGLE_SIZE: int = 3
 
     CHROMA_SERVER_AUTHN_PROVIDER: str = Field(..., env="CHROMA_SERVER_AUTHN_PROVIDER")
     CHROMA_SERVER_AUTHN_CREDENTIALS: str = Field(..., env="CHROMA_SERVER_AUTHN_CREDENTIALS")
@@ -38,8 +62,20 @@ class Settings(BaseSettings):
 
     BATCH_SIZE: int = 10
 
+    # per-document retry policy: backoff doubles after every failed attempt, capped at the max
+    VECTORIZATION_MAX_ATTEMPTS: int = 5
+    VECTORIZATION_RETRY_BACKOFF: int = 60
+    VECTORIZATION_RETRY_BACKOFF_MAX: int = 6 * 60 * 60
+
     # log info
-    FILE_LOG_LEVEL: str = Field("DEBUG", env="FILE_LOG_LEVEL")
+    FILE_LOG_LEVEL: str = Field("INFO", env="FILE_LOG_LEVEL")
+    CONSOLE_LOG_LEVEL: str = Field("INFO", env="CONSOLE_LOG_LEVEL")
+    # level used for per-document lines inside the worker loops and db handlers
+    HOT_PATH_LOG_LEVEL: str = Field("DEBUG", env="HOT_PATH_LOG_LEVEL")
+    # hand records to a background writer thread instead of writing inline
+    LOG_ENQUEUE: bool = Field(True, env="LOG_ENQUEUE")
+    # emit structured JSON records instead of the plain text format
+    LOG_SERIALIZE: bool = Field(False, env="LOG_SERIALIZE")
 
     class Config:
         case_sensitive = True
@@ -1,3 +1,5 @@
+import sys
+
 from loguru import logger
 
 from app.core.config import settings
@@ -9,15 +11,32 @@ class LoggerInstance:
         """
         LoggerInstance is an object of loguru module.
         It is Used to trace and store various logging information of the API's
+
+        With LOG_ENQUEUE set, only the sink write (file I/O, rotation, compression)
+        moves to a background thread; formatting and the LOG_SERIALIZE JSON dump still
+        run in the calling thread. Per-document messages should be logged with
+        `hot_path_log` so they are dropped before any formatting when
+        HOT_PATH_LOG_LEVEL is below the configured sink levels.
         """
 
         log_format = "{time} | <level>{level}</level> | {message} | {file} | {line} | {function} | {exception}"
 
+        # drop loguru's default DEBUG stderr handler and re-add it at a configured level
+        logger.remove()
+        logger.add(
+            sink=sys.stderr,
+            format=log_format,
+            level=settings.CONSOLE_LOG_LEVEL,
+            enqueue=settings.LOG_ENQUEUE,
+            serialize=settings.LOG_SERIALIZE
+        )
         logger.add(
             sink="logs/logfile.log",
-            colorize=True,
+            colorize=False,
             format=log_format,
             level=settings.FILE_LOG_LEVEL,
+            enqueue=settings.LOG_ENQUEUE,
+            serialize=settings.LOG_SERIALIZE,
             compression='zip',
             rotation='10 MB',
             encoding='utf-8',
@@ -28,3 +47,12 @@ class LoggerInstance:
 
 
 logger = LoggerInstance()  # noqa
+
+
+def hot_path_log(message: str, *args, **kwargs):
+    """
+    Log a per-item message at HOT_PATH_LOG_LEVEL.
+    Arguments are passed through un-formatted; loguru only applies `message.format(...)`
+    when a sink accepts the level, so disabled hot-path lines cost no string building.
+    """
+    logger.opt(depth=1).log(settings.HOT_PATH_LOG_LEVEL, message, *args, **kwargs)
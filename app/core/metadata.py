@@ -0,0 +1,102 @@
+import math
+import warnings
+from datetime import date, datetime, timezone
+from typing import Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+_NAT = np.datetime64("NaT", "s").astype("int64")
+
+
+def _to_naive_utc(value: Any):
+    """
+    Normalizes a single date value for numpy. Aware datetimes are converted to UTC;
+    naive ones are taken as UTC, which is how pymongo returns stored dates.
+    Strings are passed through for bulk parsing.
+    """
+    try:
+        if isinstance(value, datetime):
+            if value.tzinfo is not None:
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            return value
+        if isinstance(value, date):
+            return datetime(value.year, value.month, value.day)
+        if isinstance(value, str):
+            return value.strip() or None
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            return np.datetime64(int(value), "s")
+    except (OverflowError, ValueError):
+        pass
+    return None
+
+
+def _parse_one(value) -> Optional[int]:
+    """
+    Slow path for values numpy cannot parse on its own (offsets, `Z` suffix, garbage).
+    Never raises; anything it cannot make sense of comes back as None.
+    """
+    if value is None:
+        return None
+    try:
+        if not isinstance(value, str):
+            epoch = np.datetime64(value, "s").astype("int64")
+            return None if epoch == _NAT else int(epoch)
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp())
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def to_epoch_seconds(values: Iterable[Any]) -> List[Optional[int]]:
+    """
+    Converts a batch of dates (datetime, date, ISO-8601 string or epoch number)
+    to UTC epoch seconds in one numpy pass, keeping time of day.
+    Values that cannot be parsed come back as None.
+    """
+    normalized = [_to_naive_utc(value) for value in values]
+    if not normalized:
+        return []
+
+    try:
+        with warnings.catch_warnings():
+            # numpy only warns on timezone offsets and silently shifts them; parse those ourselves
+            warnings.simplefilter("error", DeprecationWarning)
+            epochs = np.array(normalized, dtype="datetime64[s]").astype("int64")
+        return [None if epoch == _NAT else int(epoch) for epoch in epochs]
+    except (ValueError, TypeError, OverflowError, DeprecationWarning):
+        return [_parse_one(value) for value in normalized]
+
+
+def convert_to_timestamp(value: Any) -> int:
+    """Converts a single date to UTC epoch seconds, raising ValueError if it cannot be parsed."""
+    epoch = to_epoch_seconds([value])[0]
+    if epoch is None:
+        raise ValueError(f"Unparseable date: {value!r}")
+    return epoch
+
+
+def build_chroma_metadata(documents: List[dict]) -> List[Tuple[Optional[dict], Optional[str]]]:
+    """
+    Builds ChromaDB metadata for a batch of MongoDB articles with a single date
+    conversion. Returns a `(metadata, error)` pair per document, in order; exactly
+    one of the two is set.
+    """
+    now = datetime.utcnow()
+    timestamps = to_epoch_seconds(doc.get("publish_date") or now for doc in documents)
+
+    prepared = []
+    for doc, timestamp in zip(documents, timestamps):
+        if not doc.get("url"):
+            prepared.append((None, "missing url"))
+        elif timestamp is None:
+            prepared.append((None, f"unparseable publish_date: {doc.get('publish_date')!r}"))
+        else:
+            prepared.append(({
+                "title": doc.get("title", "No Title"),
+                "url": doc["url"],
+                "publish_date": timestamp
+            }, None))
+    return prepared
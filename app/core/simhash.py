@@ -0,0 +1,59 @@
+import hashlib
+import re
+from typing import List, Optional
+
+import numpy as np
+
+
+HASH_BITS = 64
+
+# keep word characters and the whole Bengali block (vowel signs are not `\w`); drop punctuation such as the danda
+_NON_TEXT = re.compile(r"[^\w\s\u0980-\u09FF]+")
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercases the text, strips punctuation and splits it into words."""
+    return _NON_TEXT.sub(" ", text.lower()).split()
+
+
+def simhash(text: str, shingle_size: int = 3, min_tokens: int = 0) -> Optional[int]:
+    """
+    64-bit SimHash over word shingles of the normalized text. Reprints that differ
+    only in a few words land within a small Hamming distance of each other.
+    Returns None for texts shorter than `min_tokens`, where collisions are too likely.
+    """
+    tokens = normalize_tokens(text or "")
+    if not tokens or len(tokens) < min_tokens:
+        return None
+
+    shingles = {" ".join(tokens[i:i + shingle_size]) for i in range(max(len(tokens) - shingle_size + 1, 1))}
+    hashes = np.frombuffer(
+        b"".join(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest() for shingle in shingles),
+        dtype=">u8"
+    )
+
+    # one row of 64 bits per shingle, most significant bit first; a bit is set when most shingles set it
+    bits = np.unpackbits(hashes.view(np.uint8)).reshape(-1, HASH_BITS)
+    votes = bits.sum(axis=0) * 2 > len(hashes)
+    return int.from_bytes(np.packbits(votes).tobytes(), "big")
+
+
+def hamming_distance(first: int, second: int) -> int:
+    return bin(first ^ second).count("1")
+
+
+def band_keys(fingerprint: int, max_distance: int) -> List[str]:
+    """
+    Splits the fingerprint into `max_distance + 1` bands. By pigeonhole, two fingerprints
+    within `max_distance` bits of each other share at least one band exactly, so an
+    exact match on any band key finds every candidate.
+    """
+    bands = max_distance + 1
+    width = HASH_BITS // bands
+    keys = []
+    for band in range(bands):
+        # the last band takes the leftover bits when 64 does not divide evenly
+        bits = HASH_BITS - width * band if band == bands - 1 else width
+        value = (fingerprint >> (width * band)) & ((1 << bits) - 1)
+        keys.append(f"{band}:{value:x}")
+    return keys
@@ -1,2 +1 @@
-def convert_to_timestamp(date_str):
-    return int(datetime.strptime(date_str, "%Y-%m-%d").timestamp())
\ No newline at end of file
+from app.core.metadata import convert_to_timestamp, to_epoch_seconds  # noqa
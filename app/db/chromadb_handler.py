@@ -1,12 +1,12 @@
 import time
 from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime
 import chromadb
 from chromadb.config import Settings
 from chromadb import HttpClient
 from chromadb.errors import ChromaError
 from app.core.config import settings
-from app.core.logger import logger
+from app.core.logger import logger, hot_path_log
+from app.core.metadata import convert_to_timestamp, to_epoch_seconds
 
 
 
@@ -66,7 +66,7 @@ class ChromaDB:
     def convert_to_timestamp(self, date_str: str) -> int:
         """Convert date string to timestamp"""
         try:
-            return int(datetime.strptime(date_str, "%Y-%m-%d").timestamp())
+            return convert_to_timestamp(date_str)
         except ValueError as e:
             logger.exception(f"Error converting date {date_str} to timestamp: {e}")
             raise
@@ -79,7 +79,7 @@ class ChromaDB:
                 embeddings=[embedding],
                 metadatas=[metadata]
             )
-            logger.debug(f"Successfully added document {news_id} to ChromaDB")
+            hot_path_log("Successfully added document {} to ChromaDB", news_id)
             return True
             
         except ChromaError as e:
@@ -105,7 +105,7 @@ class ChromaDB:
                 metadatas=metadatas
             )
             
-            logger.info(f"Successfully added {len(items)} documents to ChromaDB")
+            hot_path_log("Successfully added {} documents to ChromaDB", len(items))
             return len(items)
             
         except ChromaError as e:
@@ -130,7 +130,7 @@ class ChromaDB:
                 include=include
             )
             
-            logger.debug(f"Found {len(results.get('ids', [[]])[0])} similar documents")
+            hot_path_log("Found {} similar documents", len(results.get('ids', [[]])[0]))
             return results
             
         except ChromaError as e:
@@ -144,8 +144,12 @@ class ChromaDB:
                          distance_threshold: float = 0.1) -> List[Dict[str, Any]]:
         """Search for duplicate documents within a date range"""
         try:
-            start_timestamp = self.convert_to_timestamp(date_range[0])
-            end_timestamp = self.convert_to_timestamp(date_range[1])
+            start_timestamp, end_timestamp = to_epoch_seconds(date_range)
+            if start_timestamp is None or end_timestamp is None:
+                raise ValueError(f"Unparseable date range: {date_range}")
+            # a bare YYYY-MM-DD end date covers the whole day now that timestamps keep time of day
+            if isinstance(date_range[1], str) and len(date_range[1].strip()) == 10:
+                end_timestamp += 24 * 60 * 60 - 1
             
             where_clause = {
                 "$and": [
@@ -170,7 +174,7 @@ class ChromaDB:
                             "distance": distance
                         })
             
-            logger.info(f"Found {len(duplicates)} potential duplicates")
+            hot_path_log("Found {} potential duplicates", len(duplicates))
             return duplicates
             
         except Exception as e:
@@ -188,7 +192,7 @@ class ChromaDB:
                 include=include
             )
             
-            logger.debug(f"Retrieved {len(results.get('ids', []))} documents by IDs")
+            hot_path_log("Retrieved {} documents by IDs", len(results.get('ids', [])))
             return results
             
         except ChromaError as e:
@@ -212,7 +216,7 @@ class ChromaDB:
             
             self.collection.update(**update_kwargs)
             
-            logger.debug(f"Successfully updated document {news_id}")
+            hot_path_log("Successfully updated document {}", news_id)
             return True
             
         except ChromaError as e:
@@ -0,0 +1,209 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metadata import to_epoch_seconds
+from app.db.mongo_handler import Mongo
+from app.schemas import VECTORIZATION_STATUS_FIELD as STATUS_FIELD, VectorizationStatus
+
+
+UNKNOWN_DAY = "unknown"
+COUNTER_FIELDS = ("documents", "words", "sentences", "vectorized", "near_duplicates", "failed")
+
+
+class CorpusStats:
+    """
+    Per-domain/per-day corpus counters kept in STATS_COLLECTION.
+
+    The vectorization worker increments them with upserts as documents reach a final
+    state (vectorized or failed), so totals are read from a handful of counter
+    documents instead of aggregating the whole article collection. `reconcile`
+    recomputes them from the articles to correct drift.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """Gets the singleton instance, creating it if it doesn't exist."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.mongodb = Mongo.get_instance()
+        self.collection = settings.STATS_COLLECTION
+
+    @staticmethod
+    def _days(documents: List[dict]) -> List[str]:
+        """UTC publish day (YYYY-MM-DD) of each document, computed in one pass."""
+        epochs = to_epoch_seconds(doc.get("publish_date") for doc in documents)
+        days = np.array([np.datetime64("NaT") if epoch is None else epoch for epoch in epochs],
+                        dtype="datetime64[s]").astype("datetime64[D]").astype(str)
+        return [UNKNOWN_DAY if day == "NaT" else day for day in days]
+
+    def record_batch(self, completed: List[Tuple[dict, Optional[float]]], failed: List[dict]) -> int:
+        """
+        Adds a batch of final-state documents to the counters.
+        `completed` holds (document, embedding latency in ms) pairs for vectorized
+        documents, with a None latency for near-duplicates that reused another
+        article's embedding; `failed` the documents that reached the terminal failed state.
+        """
+        documents = [doc for doc, _ in completed] + failed
+        if not documents:
+            return 0
+
+        increments = defaultdict(lambda: defaultdict(int))
+        for index, (doc, day) in enumerate(zip(documents, self._days(documents))):
+            counters = increments[(doc.get("domain") or "unknown", day)]
+            counters["documents"] += 1
+            counters["words"] += doc.get("word_count") or 0
+            counters["sentences"] += doc.get("sentence_count") or 0
+            if index < len(completed):
+                counters["vectorized"] += 1
+                latency_ms = completed[index][1]
+                if latency_ms is None:
+                    counters["near_duplicates"] += 1
+                else:
+                    counters["embedding_latency_ms"] += latency_ms
+                    counters["latency_samples"] += 1
+            else:
+                counters["failed"] += 1
+
+        return self._apply(increments)
+
+    def remove_failed(self, documents: List[dict]) -> int:
+        """
+        Takes documents in the terminal failed state back out of the counters, for
+        when they are requeued; otherwise they would be counted again once they complete.
+        """
+        if not documents:
+            return 0
+
+        increments = defaultdict(lambda: defaultdict(int))
+        for doc, day in zip(documents, self._days(documents)):
+            counters = increments[(doc.get("domain") or "unknown", day)]
+            counters["documents"] -= 1
+            counters["failed"] -= 1
+            counters["words"] -= doc.get("word_count") or 0
+            counters["sentences"] -= doc.get("sentence_count") or 0
+        return self._apply(increments)
+
+    def _apply(self, increments: Dict[Tuple[str, str], Dict[str, int]]) -> int:
+        """One $inc upsert per (domain, day) key, sent as a single bulk write."""
+        operations = [
+            UpdateOne(
+                {"_id": f"{domain}:{day}"},
+                {"$inc": dict(counters), "$setOnInsert": {"domain": domain, "day": day}},
+                upsert=True
+            )
+            for (domain, day), counters in increments.items()
+        ]
+        return self.mongodb.bulk_update(self.collection, operations)
+
+    def reconcile(self, since: Optional[datetime] = None) -> int:
+        """
+        Recomputes document, word, sentence, vectorized, near-duplicate and failed counters from the
+        article collection and overwrites them. Counters in scope are zeroed first, so days
+        whose articles all went back to pending are cleared too. Latency counters are left
+        untouched since they cannot be recovered from the articles.
+        With `since`, only counters for UTC days on or after it are rebuilt; articles are
+        assigned to days the same way `record_batch` does, whether publish_date is stored
+        as a date, an ISO string or epoch seconds.
+        Increments written while this runs may be overwritten; run it when the worker is quiet.
+        """
+        publish_date = {"$cond": [
+            {"$isNumber": "$publish_date"},
+            {"$convert": {"input": {"$multiply": ["$publish_date", 1000]}, "to": "date",
+                          "onError": None, "onNull": None}},
+            {"$convert": {"input": "$publish_date", "to": "date", "onError": None, "onNull": None}}
+        ]}
+        scope = {}
+        if since is not None:
+            scope = {"day": {"$gte": since.strftime("%Y-%m-%d"), "$ne": UNKNOWN_DAY}}
+
+        pipeline = [
+            {"$match": {
+                STATUS_FIELD: {"$in": [VectorizationStatus.complete.value, VectorizationStatus.failed.value]}
+            }},
+            {"$project": {
+                "domain": {"$ifNull": ["$domain", "unknown"]},
+                "word_count": 1,
+                "sentence_count": 1,
+                "vectorized": {"$cond": [{"$eq": [f"${STATUS_FIELD}", VectorizationStatus.complete.value]}, 1, 0]},
+                "near_duplicate": {"$cond": [{"$ifNull": ["$near_duplicate_of", False]}, 1, 0]},
+                "day": {"$dateToString": {"format": "%Y-%m-%d", "date": publish_date, "onNull": UNKNOWN_DAY}}
+            }},
+            {"$match": scope},
+            {"$group": {
+                "_id": {"domain": "$domain", "day": "$day"},
+                "documents": {"$sum": 1},
+                "words": {"$sum": "$word_count"},
+                "sentences": {"$sum": "$sentence_count"},
+                "vectorized": {"$sum": "$vectorized"},
+                "near_duplicates": {"$sum": "$near_duplicate"}
+            }}
+        ]
+
+        self.mongodb.update_many(
+            collection=self.collection,
+            query=scope,
+            updated_value={"$set": {field: 0 for field in COUNTER_FIELDS}}
+        )
+
+        operations = []
+        for row in self.mongodb.aggregate(settings.MONGO_COLLECTION, pipeline):
+            domain, day = row["_id"]["domain"], row["_id"]["day"]
+            operations.append(UpdateOne(
+                {"_id": f"{domain}:{day}"},
+                {"$set": {
+                    "domain": domain,
+                    "day": day,
+                    "documents": row["documents"],
+                    "words": row["words"],
+                    "sentences": row["sentences"],
+                    "vectorized": row["vectorized"],
+                    "near_duplicates": row["near_duplicates"],
+                    "failed": row["documents"] - row["vectorized"]
+                }},
+                upsert=True
+            ))
+
+        updated = self.mongodb.bulk_update(self.collection, operations)
+        logger.info("Reconciled {} corpus stat counters", updated)
+        return updated
+
+    def domain_totals(self, start_day: Optional[str] = None, end_day: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Per-domain totals from the counters, optionally limited to an inclusive
+        YYYY-MM-DD day range. Same shape as `Mongo.estimate_word_sentence_count`,
+        plus vectorized/failed counts, the average embedding latency and the share of
+        vectorized documents that skipped encoding as near-duplicates.
+        """
+        match = {}
+        if start_day or end_day:
+            match["day"] = {"$ne": UNKNOWN_DAY}
+            if start_day:
+                match["day"]["$gte"] = start_day
+            if end_day:
+                match["day"]["$lte"] = end_day
+
+        group = {"_id": "$domain", "embedding_latency_ms": {"$sum": "$embedding_latency_ms"},
+                 "latency_samples": {"$sum": "$latency_samples"}}
+        group.update({field: {"$sum": f"${field}"} for field in COUNTER_FIELDS})
+
+        totals = {}
+        for row in self.mongodb.aggregate(self.collection, [{"$match": match}, {"$group": group}]):
+            counts = {field: int(row[field]) for field in COUNTER_FIELDS}
+            counts["avg_embedding_latency_ms"] = (
+                row["embedding_latency_ms"] / row["latency_samples"] if row["latency_samples"] else None
+            )
+            counts["near_duplicate_rate"] = (
+                counts["near_duplicates"] / counts["vectorized"] if counts["vectorized"] else None
+            )
+            totals[row["_id"]] = counts
+        return totals
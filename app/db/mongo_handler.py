@@ -1,6 +1,6 @@
 import time
 import pymongo
-from pymongo import MongoClient, DESCENDING, errors
+from pymongo import MongoClient, DESCENDING, UpdateOne, errors
 from pymongo.write_concern import WriteConcern
 from app.core.config import settings
 from app.core.logger import logger
@@ -62,6 +62,14 @@ class Mongo:
         except (AttributeError, pymongo.errors.OperationFailure) as e:
             logger.exception(e)
 
+    def create_ttl_index(self, collection: str, key: str, expire_after_seconds: int):
+        try:
+            if not self.has_index(collection, key):
+                self.db[collection].create_index(key, expireAfterSeconds=expire_after_seconds)
+                logger.success(f"ttl index created successfully for collection: {collection}, key:{key}")
+        except (AttributeError, pymongo.errors.OperationFailure) as e:
+            logger.exception(e)
+
     def close_connection(self):
         self.client.close()
 
@@ -121,6 +129,30 @@ class Mongo:
             logger.exception(e)
             return False
 
+    def update_many(self, collection: str, query: dict, updated_value: dict) -> int:
+        try:
+            return self.db[collection].update_many(query, updated_value).modified_count
+        except (AssertionError, pymongo.errors.OperationFailure) as e:
+            logger.exception(e)
+            return 0
+
+    def bulk_update(self, collection: str, operations: List[UpdateOne], ordered=False) -> int:
+        try:
+            if not operations:
+                return 0
+            result = self.db[collection].bulk_write(operations, ordered=ordered)
+            return result.modified_count + result.upserted_count
+        except (AssertionError, pymongo.errors.OperationFailure, errors.BulkWriteError) as e:
+            logger.exception(e)
+            return 0
+
+    def aggregate(self, collection: str, pipeline: List[dict]):
+        try:
+            return self.db[collection].aggregate(pipeline)
+        except (AttributeError, pymongo.errors.OperationFailure) as e:
+            logger.exception(f"Error aggregating {collection}: {e}")
+            return []
+
     def find_one(self, collection: str, query: dict):
         try:
             return self.db[collection].find_one(query)
@@ -128,9 +160,9 @@ class Mongo:
             logger.exception(f"Error fetching documents from {collection}: {e}")
             return None
         
-    def find_many(self, collection: str, query: dict, limit:int):
+    def find_many(self, collection: str, query: dict, limit:int, projection: dict = None):
         try:
-            return self.db[collection].find(query).limit(limit)
+            return self.db[collection].find(query, projection).limit(limit)
         except (AttributeError, pymongo.errors.OperationFailure) as e:
             logger.exception(f"Error fetching documents from {collection}: {e}")
             return []
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logger import hot_path_log
+from app.core.simhash import band_keys, hamming_distance, simhash
+from app.db.mongo_handler import Mongo
+
+
+class NearDuplicateIndex:
+    """
+    SimHash index of recently vectorized articles, kept in NEAR_DUP_COLLECTION.
+
+    Each entry stores the article's fingerprint and its band keys; a new article is
+    looked up by band key and confirmed by Hamming distance. Entries expire through
+    a TTL index after NEAR_DUP_WINDOW seconds. Only articles that were actually
+    encoded are indexed, so every match points at a canonical embedding.
+    """
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        """Gets the singleton instance, creating it if it doesn't exist."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.mongodb = Mongo.get_instance()
+        self.collection = settings.NEAR_DUP_COLLECTION
+        self.mongodb.create_index(self.collection, "bands")
+        self.mongodb.create_ttl_index(self.collection, "indexed_at", settings.NEAR_DUP_WINDOW)
+
+    @staticmethod
+    def fingerprint(text: str) -> Optional[int]:
+        return simhash(text, settings.NEAR_DUP_SHINGLE_SIZE, settings.NEAR_DUP_MIN_TOKENS)
+
+    def find_canonical(self, fingerprint: Optional[int], article_id, url: str) -> Optional[dict]:
+        """
+        Returns the closest indexed article within NEAR_DUP_MAX_DISTANCE bits, if any.
+        The article's own entry (left behind by an earlier, interrupted attempt) is never a match.
+        """
+        if fingerprint is None:
+            return None
+
+        candidates = self.mongodb.find_many(
+            collection=self.collection,
+            query={
+                "bands": {"$in": band_keys(fingerprint, settings.NEAR_DUP_MAX_DISTANCE)},
+                "url": {"$ne": url},
+                "article_id": {"$ne": article_id},
+                # TTL cleanup runs only once a minute, so the window is enforced here as well
+                "indexed_at": {"$gte": datetime.utcnow() - timedelta(seconds=settings.NEAR_DUP_WINDOW)}
+            },
+            limit=50
+        )
+
+        best, best_distance = None, settings.NEAR_DUP_MAX_DISTANCE + 1
+        for candidate in candidates:
+            distance = hamming_distance(fingerprint, int(candidate["simhash"], 16))
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+
+        if best is not None:
+            hot_path_log("Near-duplicate of {} at distance {}", best["url"], best_distance)
+        return best
+
+    def add(self, fingerprint: Optional[int], article_id, url: str) -> bool:
+        if fingerprint is None:
+            return False
+        return self.mongodb.update_one(
+            collection=self.collection,
+            query={"_id": url},
+            updated_value={"$set": {
+                "article_id": article_id,
+                "url": url,
+                "simhash": f"{fingerprint:016x}",
+                "bands": band_keys(fingerprint, settings.NEAR_DUP_MAX_DISTANCE),
+                "indexed_at": datetime.utcnow()
+            }}
+        )
@@ -3,4 +3,20 @@ from enum import Enum
 class Backgroud_tasks(str, Enum):
     sentiment_task = "sentiment_classification_task_status"
     ner_task = "ner_task_status"
-    vectorization_and_news_search_task = "vectorization&news_search_task_status"
\ No newline at end of file
+    vectorization_and_news_search_task = "vectorization&news_search_task_status"
+
+
+class VectorizationStatus(int, Enum):
+    failed = -1
+    pending = 0
+    complete = 1
+    queued = 2
+
+
+# fields the vectorization pipeline keeps on each article document
+VECTORIZATION_STATUS_FIELD = Backgroud_tasks.vectorization_and_news_search_task.value
+VECTORIZATION_ATTEMPTS_FIELD = "vectorization_attempts"
+VECTORIZATION_NEXT_ATTEMPT_FIELD = "vectorization_next_attempt_at"
+VECTORIZATION_ERROR_FIELD = "vectorization_error"
+VECTORIZATION_QUEUE_TOKEN_FIELD = "vectorization_queue_token"
+VECTORIZATION_DELIVERIES_FIELD = "vectorization_deliveries"
@@ -0,0 +1,173 @@
+from datetime import datetime
+from typing import List
+
+from bson import ObjectId
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.logger import logger
+from app.schemas import VECTORIZATION_DELIVERIES_FIELD, VECTORIZATION_QUEUE_TOKEN_FIELD, VectorizationStatus
+from app.tasks.vectorization_state import STATUS_FIELD
+
+
+_worker = None
+
+
+def get_worker():
+    """Lazily builds one VectorizationWorker per Celery worker process."""
+    global _worker
+    if _worker is None:
+        # imported here so the producer never loads the model or connects to ChromaDB
+        from app.tasks.vectorization_and_news_search_task import VectorizationWorker
+        _worker = VectorizationWorker()
+    return _worker
+
+
+def id_query(article_ids: List[str]) -> dict:
+    """Ids travel as strings over the broker; match both the string and ObjectId form."""
+    object_ids = [ObjectId(article_id) for article_id in article_ids if ObjectId.is_valid(article_id)]
+    return {"_id": {"$in": list(article_ids) + object_ids}}
+
+
+def queued_query(article_ids: List[str], queue_token: str) -> dict:
+    """
+    Only documents still queued under this task's token belong to it. Ids that were
+    already completed, sent back to pending with a backoff, or re-enqueued under a new
+    token after `requeue_stale` are skipped when a message is retried or redelivered.
+    """
+    return {"$and": [
+        id_query(article_ids),
+        {STATUS_FIELD: VectorizationStatus.queued.value, VECTORIZATION_QUEUE_TOKEN_FIELD: queue_token}
+    ]}
+
+
+def dead_letter(article_ids: List[str], errors: dict, task_id: str):
+    """Records documents that will not be retried in the dead-letter collection."""
+    worker = get_worker()
+    worker.mongodb.insert_many(
+        collection=settings.DEAD_LETTER_COLLECTION,
+        items=[{
+            "article_id": article_id,
+            "error": errors.get(article_id, "unknown error"),
+            "task_id": task_id,
+            "failed_at": datetime.utcnow()
+        } for article_id in article_ids],
+        w=1
+    )
+    logger.error("[Vectorization Task] Dead-lettered {} documents from task {}", len(article_ids), task_id)
+
+
+def dead_letter_task(article_ids: List[str], error: str, task_id: str):
+    """Records a task payload whose retries ran out; its documents are not blamed."""
+    get_worker().mongodb.insert_one(
+        collection=settings.DEAD_LETTER_COLLECTION,
+        item={
+            "article_ids": article_ids,
+            "error": error,
+            "task_id": task_id,
+            "failed_at": datetime.utcnow()
+        }
+    )
+    logger.error("[Vectorization Task] Dead-lettered task {} with {} documents: {}", task_id, len(article_ids), error)
+
+
+def count_delivery(article_ids: List[str], queue_token: str, step: int = 1):
+    """
+    Counts a hand-out of the batch on its queued documents. Late acks redeliver a batch
+    whose worker died mid-way, and only this counter shows that it never finished.
+    """
+    get_worker().mongodb.update_many(
+        collection=settings.MONGO_COLLECTION,
+        query=queued_query(article_ids, queue_token),
+        updated_value={"$inc": {VECTORIZATION_DELIVERIES_FIELD: step}}
+    )
+
+
+def charge_lost_deliveries(documents: List[dict]) -> dict:
+    """
+    Charges a failed attempt to documents whose batch was handed out more than
+    CELERY_MAX_DELIVERIES times without finishing, which sends them back to pending
+    with a backoff (or to the failed state), so a batch that kills its worker is not
+    redelivered forever.
+    """
+    worker = get_worker()
+    errors, exhausted_docs = {}, []
+    for doc in documents:
+        error = f"WorkerLost: batch delivered {doc[VECTORIZATION_DELIVERIES_FIELD]} times without finishing"
+        errors[doc["_id"]] = error
+        if worker.record_failure(doc, error):
+            exhausted_docs.append(doc)
+    worker.corpus_stats.record_batch([], exhausted_docs)
+    return {"failed": errors, "exhausted": [doc["_id"] for doc in exhausted_docs]}
+
+
+@celery_app.task(
+    bind=True,
+    rate_limit=settings.CELERY_VECTORIZATION_RATE_LIMIT,
+    max_retries=settings.CELERY_MAX_RETRIES
+)
+def vectorize_batch(self, article_ids: List[str], queue_token: str) -> dict:
+    """
+    Embeds and stores a batch of articles and returns the per-batch result stored
+    in the result backend.
+
+    Documents that fail individually go back to pending with their own backoff
+    (see vectorization_state) and are dead-lettered once they run out of attempts.
+    Failures of the batch as a whole (database or vector store outages) are retried
+    with exponential backoff. Once retries are exhausted the task payload is
+    dead-lettered and its documents go back to pending without using up attempts.
+    A batch redelivered more than CELERY_MAX_DELIVERIES times without finishing
+    charges each of its documents an attempt instead of being processed again.
+    """
+    worker = get_worker()
+    try:
+        count_delivery(article_ids, queue_token)
+        documents = list(worker.mongodb.find_many(
+            collection=settings.MONGO_COLLECTION,
+            query=queued_query(article_ids, queue_token),
+            limit=len(article_ids)
+        ))
+        lost = [doc for doc in documents
+                if doc.get(VECTORIZATION_DELIVERIES_FIELD, 0) > settings.CELERY_MAX_DELIVERIES]
+        lost_result = charge_lost_deliveries(lost)
+        lost_ids = {doc["_id"] for doc in lost}
+        result = worker.process_batch([doc for doc in documents if doc["_id"] not in lost_ids])
+    except Exception as e:
+        try:
+            # this delivery ended in a handled failure, so it must not look like a lost one
+            count_delivery(article_ids, queue_token, step=-1)
+        except Exception as count_error:
+            logger.warning(
+                "[Vectorization Task] Could not uncount delivery of task {}: {}", self.request.id, count_error
+            )
+        if self.request.retries < self.max_retries:
+            countdown = settings.CELERY_RETRY_BACKOFF * (2 ** self.request.retries)
+            raise self.retry(exc=e, countdown=countdown)
+        error = f"{type(e).__name__}: {e}"
+        worker.mongodb.update_many(
+            collection=settings.MONGO_COLLECTION,
+            query=queued_query(article_ids, queue_token),
+            updated_value={"$set": {STATUS_FIELD: VectorizationStatus.pending.value}}
+        )
+        dead_letter_task(article_ids, error, self.request.id)
+        return {
+            "processed": 0,
+            "near_duplicates": 0,
+            "failed": len(article_ids),
+            "dead_lettered": article_ids,
+            "retries": self.request.retries
+        }
+
+    errors = {str(doc_id): error for doc_id, error in {**lost_result["failed"], **result["failed"]}.items()}
+    exhausted = [str(doc_id) for doc_id in lost_result["exhausted"] + result["exhausted"]]
+    if exhausted:
+        dead_letter(exhausted, errors, self.request.id)
+
+    return {
+        "processed": len(result["processed"]),
+        "near_duplicates": result["near_duplicates"],
+        "failed": len(errors),
+        "deferred": len(result["deferred"]),
+        "dead_lettered": exhausted,
+        "retries": self.request.retries
+    }
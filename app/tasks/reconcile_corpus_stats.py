@@ -0,0 +1,15 @@
+import argparse
+from datetime import datetime
+
+from app.core.logger import logger
+from app.db.corpus_stats import CorpusStats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute corpus stat counters from the article collection.")
+    parser.add_argument("--since", type=datetime.fromisoformat,
+                        help="only rebuild counters for UTC days on or after this date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    updated = CorpusStats.get_instance().reconcile(args.since)
+    logger.info("Corpus stats reconciliation finished, {} counters updated", updated)
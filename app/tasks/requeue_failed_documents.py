@@ -0,0 +1,52 @@
+import argparse
+import re
+
+from bson import ObjectId
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.corpus_stats import CorpusStats
+from app.db.mongo_handler import Mongo
+from app.schemas import VectorizationStatus
+from app.tasks.vectorization_state import ERROR_FIELD, STATUS_FIELD, requeue_update
+
+
+def requeue_failed(ids=None, error_contains=None) -> int:
+    """
+    Returns documents in the terminal failed state to pending with a clean attempt
+    history, and takes them back out of the corpus stat counters. Optionally limited
+    to specific ids or to errors containing a substring.
+    """
+    query = {STATUS_FIELD: VectorizationStatus.failed.value}
+    if ids:
+        query["_id"] = {"$in": list(ids) + [ObjectId(_id) for _id in ids if ObjectId.is_valid(_id)]}
+    if error_contains:
+        query[ERROR_FIELD] = {"$regex": re.escape(error_contains)}
+
+    mongodb = Mongo.get_instance()
+    documents = list(mongodb.find_many(
+        collection=settings.MONGO_COLLECTION,
+        query=query,
+        limit=0,
+        projection={"domain": 1, "publish_date": 1, "word_count": 1, "sentence_count": 1}
+    ))
+    if not documents:
+        return 0
+
+    requeued = mongodb.update_many(
+        collection=settings.MONGO_COLLECTION,
+        query={"_id": {"$in": [doc["_id"] for doc in documents]}, STATUS_FIELD: VectorizationStatus.failed.value},
+        updated_value=requeue_update()
+    )
+    CorpusStats.get_instance().remove_failed(documents)
+    return requeued
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Requeue documents that failed vectorization.")
+    parser.add_argument("ids", nargs="*", help="document ids to requeue (default: every failed document)")
+    parser.add_argument("--error-contains", help="only requeue documents whose error contains this text")
+    args = parser.parse_args()
+
+    requeued = requeue_failed(args.ids, args.error_contains)
+    logger.info("Requeued {} failed documents", requeued)
@@ -1,13 +1,24 @@
 import time
-from datetime import datetime
+from typing import Any, Dict, List, Optional
 from app.core.config import settings
-from app.core.logger import logger
-from app.schemas import Backgroud_tasks
+from app.core.logger import logger, hot_path_log
+from app.core.metadata import build_chroma_metadata
+from app.schemas import Backgroud_tasks, VectorizationStatus
 
 
 from app.db.chromadb_handler import ChromaDB
+from app.db.corpus_stats import CorpusStats
+from app.db.near_duplicate_index import NearDuplicateIndex
 from app.models.model_registry import ModelRegistry
 from app.db.mongo_handler import Mongo
+from app.tasks.vectorization_state import (
+    ATTEMPTS_FIELD, ERROR_FIELD, NEXT_ATTEMPT_FIELD, STATUS_FIELD, failure_update, pending_query
+)
+
+
+class VectorStoreError(RuntimeError):
+    """ChromaDB did not accept a document; usually an outage rather than a fault of the document."""
+
 
 class VectorizationWorker:
     """
@@ -23,11 +34,156 @@ class VectorizationWorker:
         logger.info("=================Initializing Vectorization Worker===================")
         self.chromadb = ChromaDB.get_instance()
         self.mongodb = Mongo.get_instance()
+        self.corpus_stats = CorpusStats.get_instance()
+        self.near_duplicates = NearDuplicateIndex.get_instance() if settings.NEAR_DUP_ENABLED else None
         self.model_registry = ModelRegistry.get_instance()
         self.embedding_model = self.model_registry.get_bangla_sentence_transformer()
         self.STATUS_FIELD = Backgroud_tasks.vectorization_and_news_search_task
         logger.info("Vectorization Worker initialized.")
 
+    def canonical_embedding(self, canonical: Optional[dict]) -> Optional[List[float]]:
+        """Fetches the stored embedding of a near-duplicate's canonical article, if it is still in ChromaDB."""
+        if canonical is None:
+            return None
+        embeddings = self.chromadb.get_by_ids([canonical["url"]], include=["embeddings"]).get("embeddings")
+        if embeddings is None or len(embeddings) == 0:
+            return None
+        embedding = embeddings[0]
+        return embedding.tolist() if hasattr(embedding, "tolist") else embedding
+
+    def process_document(self, doc: dict, metadata: dict) -> Optional[float]:
+        """
+        Embeds a single document, stores it in ChromaDB with its prepared metadata
+        and marks it complete in MongoDB. Returns the embedding latency in ms, or
+        None when the document was linked to a near-duplicate instead of encoded.
+        Raises on any failure so callers can decide how to retry.
+        """
+        doc_id = doc["_id"]
+        text = doc.get("text", "")
+        hot_path_log("Processing article: {} ({})", metadata["title"], doc_id)
+
+        fingerprint, canonical, latency_ms = None, None, None
+        if self.near_duplicates is not None:
+            fingerprint = self.near_duplicates.fingerprint(text)
+            canonical = self.near_duplicates.find_canonical(fingerprint, doc_id, metadata["url"])
+
+        # Reprints reuse the canonical article's embedding and skip the transformer
+        new_embedding = self.canonical_embedding(canonical)
+        if new_embedding is not None:
+            metadata = dict(metadata, near_duplicate_of=canonical["url"])
+        else:
+            canonical = None
+            encode_started = time.perf_counter()
+            new_embedding = self.embedding_model.encode(text)
+            latency_ms = (time.perf_counter() - encode_started) * 1000
+
+        if not self.chromadb.add_document(news_id=metadata["url"], embedding=new_embedding, metadata=metadata):
+            raise VectorStoreError("ChromaDB rejected the document")
+
+        # Only encoded articles become canonical copies, so links never chain
+        if self.near_duplicates is not None and canonical is None:
+            self.near_duplicates.add(fingerprint, doc_id, metadata["url"])
+
+        # Mark the document as completed (e.g., 1)
+        completed = {self.STATUS_FIELD: VectorizationStatus.complete.value}
+        if canonical is not None:
+            completed["near_duplicate_of"] = canonical["article_id"]
+        self.mongodb.update_one(
+            collection=settings.MONGO_COLLECTION,
+            query={"_id": doc_id},
+            updated_value={
+                "$set": completed,
+                "$unset": {NEXT_ATTEMPT_FIELD: "", ERROR_FIELD: ""}
+            }
+        )
+        hot_path_log("Successfully processed document: {}", doc_id)
+        return latency_ms
+
+    def record_failure(self, doc: dict, error: str) -> bool:
+        """
+        Counts a failed attempt on the document and schedules its next one with
+        exponential backoff. Returns True when the document reached the terminal
+        failed state and will not be picked up again until it is requeued.
+        """
+        attempts = doc.get(ATTEMPTS_FIELD, 0) + 1
+        update = failure_update(attempts, error)
+        self.mongodb.update_one(
+            collection=settings.MONGO_COLLECTION,
+            query={"_id": doc["_id"]},
+            updated_value=update,
+            upsert=False
+        )
+        return update["$set"][STATUS_FIELD] == VectorizationStatus.failed.value
+
+    def process_batch(self, documents: List[dict]) -> Dict[str, Any]:
+        """
+        Processes a batch of documents one by one and returns the ids that
+        succeeded, the error message of each one that failed, and the ids that
+        ran out of attempts.
+
+        Only metadata and encode errors count against a document's attempts. A
+        document ChromaDB did not accept is left pending without using up an attempt;
+        when no document of the batch reached ChromaDB the store is treated as down
+        and VectorStoreError is raised so the caller backs off the whole batch.
+        """
+        batch_started = time.perf_counter()
+        processed, failed, exhausted = [], {}, []
+        completed_docs, exhausted_docs, failures, deferred = [], [], [], []
+
+        # Metadata for the whole batch is built up front, so malformed documents
+        # fail before spending model time
+        for doc, (metadata, error) in zip(documents, build_chroma_metadata(documents)):
+            doc_id = doc["_id"]
+            try:
+                if error:
+                    raise ValueError(error)
+                latency_ms = self.process_document(doc, metadata)
+                processed.append(doc_id)
+                completed_docs.append((doc, latency_ms))
+            except VectorStoreError:
+                deferred.append(doc_id)
+            except Exception as e:
+                failures.append((doc, e))
+
+        for doc, e in failures:
+            doc_id = doc["_id"]
+            error = f"{type(e).__name__}: {e}"
+            failed[doc_id] = error
+            if self.record_failure(doc, error):
+                exhausted.append(doc_id)
+                exhausted_docs.append(doc)
+                logger.error("Giving up on document {} after repeated failures: {}", doc_id, error)
+            else:
+                logger.warning("Failed to process document {}: {}", doc_id, error)
+
+        # Documents that reached a final state feed the per-domain/per-day counters
+        self.corpus_stats.record_batch(completed_docs, exhausted_docs)
+
+        if deferred:
+            if not processed:
+                raise VectorStoreError(f"ChromaDB accepted none of the {len(deferred)} documents it was sent")
+            # the store is up but turned these down; hand them back (queued ones too) for a later batch
+            self.mongodb.update_many(
+                collection=settings.MONGO_COLLECTION,
+                query={"_id": {"$in": deferred}},
+                updated_value={"$set": {STATUS_FIELD: VectorizationStatus.pending.value}}
+            )
+
+        # One summary line per batch instead of per-document lines at INFO
+        skipped = sum(1 for _, latency_ms in completed_docs if latency_ms is None)
+        logger.info(
+            "[Vectorization Worker] Batch of {} done: {} processed ({} near-duplicates skipped encoding), "
+            "{} failed, {} deferred in {:.2f}s",
+            len(documents), len(processed), skipped, len(failed), len(deferred), time.perf_counter() - batch_started
+        )
+        return {
+            "processed": processed,
+            "failed": failed,
+            "exhausted": exhausted,
+            "deferred": deferred,
+            "near_duplicates": skipped
+        }
+
     def run(self):
         """
         The main loop for the vectorization worker. It continuously fetches
@@ -39,10 +195,9 @@ class VectorizationWorker:
         while True:
             try:
                 # Fetch a batch of documents that have not been processed yet.
-                # The query now uses a string key and checks for non-existence or a value of 0.
                 documents = list(self.mongodb.find_many(
                     collection=settings.MONGO_COLLECTION,
-                    query={"$or": [{self.STATUS_FIELD: {"$exists": False}}, {self.STATUS_FIELD: 0}]},
+                    query=pending_query(),
                     limit=settings.BATCH_SIZE
                 ))
 
@@ -51,44 +206,7 @@ class VectorizationWorker:
                     time.sleep(settings.VECTORIZATION_POLL_INTERVAL)
                     continue
 
-                logger.info(f"Found {len(documents)} documents to process.")
-
-                for doc in documents:
-                    doc_id = doc["_id"]
-
-                    try:
-                        text = doc.get("text", "")
-                        title = doc.get("title", "No Title")
-                        url = doc["url"]
-                        publish_date = doc.get("publish_date", datetime.utcnow())
-
-                        if isinstance(publish_date, datetime):
-                            publish_date_str = publish_date.strftime("%Y-%m-%d")
-                        else:
-                            publish_date_str = str(publish_date)
-
-                        logger.info(f"Processing article: {title} ({doc_id})")
-
-                        new_embedding = self.embedding_model.encode(text)
-
-                        metadata = {
-                            "title": title,
-                            "url": url,
-                            "publish_date": self.chromadb.convert_to_timestamp(publish_date_str)
-                        }
-
-                        self.chromadb.add_document(news_id=url, embedding=new_embedding, metadata=metadata)
-
-                        # Mark the document as completed (e.g., 1)
-                        self.mongodb.update_one(
-                            collection=settings.MONGO_COLLECTION,
-                            query={"_id": doc_id},
-                            updated_value={"$set": {self.STATUS_FIELD: 1}} # 1 = complete
-                        )
-                        logger.success(f"Successfully processed document: {doc_id}")
-
-                    except Exception as e:
-                        logger.error(f"Failed to process document {doc_id}: {e}")
+                self.process_batch(documents)
 
             except Exception as e:
                 logger.exception(f"An unhandled error occurred in vectorization loop: {e}")
@@ -97,4 +215,4 @@ class VectorizationWorker:
 if __name__ == "__main__":
     # Create an instance of the worker and run its loop
     worker = VectorizationWorker()
-    worker.run()
\ No newline at end of file
+    worker.run()
@@ -0,0 +1,108 @@
+import time
+import uuid
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.mongo_handler import Mongo
+from app.schemas import (
+    Backgroud_tasks, VECTORIZATION_DELIVERIES_FIELD, VECTORIZATION_QUEUE_TOKEN_FIELD, VectorizationStatus
+)
+from app.tasks.celery_vectorization_task import vectorize_batch
+from app.tasks.vectorization_state import pending_query
+
+
+class VectorizationProducer:
+    """
+    A producer class that continuously finds new articles in MongoDB and enqueues
+    their ids in batches for the Celery vectorization workers.
+    """
+    def __init__(self):
+        """
+        Initializes the producer, setting up the connection to MongoDB.
+        The embedding model is only loaded by the Celery workers.
+        """
+        logger.info("=================Initializing Vectorization Producer===================")
+        self.mongodb = Mongo.get_instance()
+        self.STATUS_FIELD = Backgroud_tasks.vectorization_and_news_search_task
+        logger.info("Vectorization Producer initialized.")
+
+    def requeue_stale(self) -> int:
+        """Returns batches that were queued but never completed (e.g. lost broker messages) to pending."""
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.CELERY_QUEUED_TIMEOUT)
+        return self.mongodb.update_many(
+            collection=settings.MONGO_COLLECTION,
+            query={self.STATUS_FIELD: VectorizationStatus.queued.value, "queued_at": {"$lt": cutoff}},
+            updated_value={"$set": {self.STATUS_FIELD: VectorizationStatus.pending.value}}
+        )
+
+    def enqueue_pending(self) -> int:
+        """
+        Marks a window of pending documents as queued and sends them out in BATCH_SIZE chunks.
+        Every batch gets its own queue token, stamped on its documents and carried in the
+        message, so an older message for the same ids (after `requeue_stale`) finds nothing to do.
+        At most BATCH_SIZE * CELERY_PRODUCER_BATCHES documents are kept in flight so the
+        broker only ever holds a bounded backlog.
+        """
+        in_flight = self.mongodb.count(
+            collection=settings.MONGO_COLLECTION,
+            query={self.STATUS_FIELD: VectorizationStatus.queued.value}
+        ) or 0
+        room = settings.BATCH_SIZE * settings.CELERY_PRODUCER_BATCHES - in_flight
+        if room <= 0:
+            return 0
+
+        documents = list(self.mongodb.find_many(
+            collection=settings.MONGO_COLLECTION,
+            query=pending_query(),
+            limit=room
+        ))
+        if not documents:
+            return 0
+
+        doc_ids = [doc["_id"] for doc in documents]
+        for start in range(0, len(doc_ids), settings.BATCH_SIZE):
+            batch_ids = doc_ids[start:start + settings.BATCH_SIZE]
+            queue_token = uuid.uuid4().hex
+            self.mongodb.update_many(
+                collection=settings.MONGO_COLLECTION,
+                query={"$and": [{"_id": {"$in": batch_ids}}, pending_query()]},
+                updated_value={"$set": {
+                    self.STATUS_FIELD: VectorizationStatus.queued.value,
+                    VECTORIZATION_QUEUE_TOKEN_FIELD: queue_token,
+                    VECTORIZATION_DELIVERIES_FIELD: 0,
+                    "queued_at": datetime.utcnow()
+                }}
+            )
+            vectorize_batch.delay([str(doc_id) for doc_id in batch_ids], queue_token)
+
+        return len(doc_ids)
+
+    def run(self):
+        """
+        The main loop for the vectorization producer. It continuously enqueues
+        pending documents and recovers batches that went stale in the queue.
+        """
+        logger.info("--- Entering Vectorization Producer Loop ---")
+
+        while True:
+            try:
+                requeued = self.requeue_stale()
+                if requeued:
+                    logger.warning("[Vectorization Producer] Returned {} stale queued documents to pending", requeued)
+
+                enqueued = self.enqueue_pending()
+                if not enqueued:
+                    logger.info("[Vectorization Producer] Nothing to enqueue. Waiting...")
+                    time.sleep(settings.VECTORIZATION_POLL_INTERVAL)
+                    continue
+
+                logger.info("[Vectorization Producer] Enqueued {} documents", enqueued)
+
+            except Exception as e:
+                logger.exception(f"An unhandled error occurred in vectorization producer loop: {e}")
+                time.sleep(settings.VECTORIZATION_POLL_INTERVAL)
+
+
+if __name__ == "__main__":
+    producer = VectorizationProducer()
+    producer.run()
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.config import settings
+from app.schemas import (
+    VECTORIZATION_ATTEMPTS_FIELD as ATTEMPTS_FIELD,
+    VECTORIZATION_ERROR_FIELD as ERROR_FIELD,
+    VECTORIZATION_NEXT_ATTEMPT_FIELD as NEXT_ATTEMPT_FIELD,
+    VECTORIZATION_STATUS_FIELD as STATUS_FIELD,
+    VectorizationStatus
+)
+
+
+def pending_query(now: Optional[datetime] = None) -> dict:
+    """Documents that are not vectorized yet and whose backoff (if any) has elapsed."""
+    now = now or datetime.utcnow()
+    return {"$and": [
+        {"$or": [{STATUS_FIELD: {"$exists": False}}, {STATUS_FIELD: VectorizationStatus.pending.value}]},
+        {"$or": [{NEXT_ATTEMPT_FIELD: {"$exists": False}}, {NEXT_ATTEMPT_FIELD: {"$lte": now}}]}
+    ]}
+
+
+def retry_delay(attempts: int) -> int:
+    """Seconds to wait before the next attempt after `attempts` failures."""
+    return min(settings.VECTORIZATION_RETRY_BACKOFF * (2 ** (attempts - 1)), settings.VECTORIZATION_RETRY_BACKOFF_MAX)
+
+
+def failure_update(attempts: int, error: str, now: Optional[datetime] = None) -> dict:
+    """
+    Update for a document whose `attempts`-th attempt just failed. It goes back to pending
+    with a next-eligible timestamp, or to the terminal failed state once attempts run out.
+    """
+    now = now or datetime.utcnow()
+    if attempts >= settings.VECTORIZATION_MAX_ATTEMPTS:
+        status = VectorizationStatus.failed.value
+    else:
+        status = VectorizationStatus.pending.value
+    return {"$set": {
+        STATUS_FIELD: status,
+        ATTEMPTS_FIELD: attempts,
+        ERROR_FIELD: error,
+        NEXT_ATTEMPT_FIELD: now + timedelta(seconds=retry_delay(attempts))
+    }}
+
+
+def requeue_update() -> dict:
+    """Update returning a document to pending with a clean attempt history."""
+    return {
+        "$set": {STATUS_FIELD: VectorizationStatus.pending.value},
+        "$unset": {ATTEMPTS_FIELD: "", NEXT_ATTEMPT_FIELD: "", ERROR_FIELD: ""}
+    }
@@ -0,0 +1,11 @@
+import os
+
+# Settings declares these as required; give the pure helpers under test something to load
+for key in ("MONGO_USER", "MONGO_PASSWORD", "MONGO_DB", "MONGO_COLLECTION", "MONGO_URI",
+            "CHROMA_SERVER_AUTHN_PROVIDER", "CHROMA_SERVER_AUTHN_CREDENTIALS"):
+    os.environ.setdefault(key, "test")
+
+# run Celery tasks inline, without a broker
+os.environ.setdefault("CELERY_BROKER_URL", "memory://")
+os.environ.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
+os.environ.setdefault("CELERY_ALWAYS_EAGER", "True")
@@ -0,0 +1,166 @@
+from bson import ObjectId
+import pytest
+
+from app.core.config import settings
+from app.schemas import VECTORIZATION_DELIVERIES_FIELD, VECTORIZATION_QUEUE_TOKEN_FIELD, VectorizationStatus
+from app.tasks import celery_vectorization_task
+from app.tasks.celery_vectorization_task import vectorize_batch
+from app.tasks.vectorization_state import STATUS_FIELD
+
+QUEUED = VectorizationStatus.queued.value
+PENDING = VectorizationStatus.pending.value
+TOKEN = "token-1"
+
+
+def _matches(doc: dict, query: dict) -> bool:
+    """The subset of the Mongo query language the task uses."""
+    for key, condition in query.items():
+        if key == "$and":
+            if not all(_matches(doc, sub_query) for sub_query in condition):
+                return False
+        elif isinstance(condition, dict) and "$in" in condition:
+            if doc.get(key) not in condition["$in"]:
+                return False
+        elif doc.get(key) != condition:
+            return False
+    return True
+
+
+class FakeMongo:
+    def __init__(self, articles):
+        self.collections = {settings.MONGO_COLLECTION: articles, settings.DEAD_LETTER_COLLECTION: []}
+
+    def find_many(self, collection, query, limit, projection=None):
+        return [dict(doc) for doc in self.collections[collection] if _matches(doc, query)][:limit or None]
+
+    def update_many(self, collection, query, updated_value):
+        matched = [doc for doc in self.collections[collection] if _matches(doc, query)]
+        for doc in matched:
+            doc.update(updated_value.get("$set", {}))
+            for field, step in updated_value.get("$inc", {}).items():
+                doc[field] = doc.get(field, 0) + step
+        return len(matched)
+
+    def insert_many(self, collection, items, w=0):
+        self.collections[collection].extend(items)
+        return len(items)
+
+    def insert_one(self, collection, item):
+        self.collections[collection].append(item)
+        return True
+
+
+class FakeCorpusStats:
+    def __init__(self):
+        self.batches = []
+
+    def record_batch(self, completed, failed):
+        self.batches.append((completed, failed))
+
+
+class FakeWorker:
+    """Stands in for VectorizationWorker; `process_batch` returns `result` or raises `error`."""
+
+    def __init__(self, articles, result=None, error=None, terminal=False):
+        self.mongodb = FakeMongo(articles)
+        self.corpus_stats = FakeCorpusStats()
+        self.result = result
+        self.error = error
+        self.terminal = terminal
+        self.batches = []
+        self.failures = []
+
+    def process_batch(self, documents):
+        self.batches.append([doc["_id"] for doc in documents])
+        if self.error:
+            raise self.error
+        return self.result or {
+            "processed": [doc["_id"] for doc in documents], "failed": {}, "exhausted": [],
+            "deferred": [], "near_duplicates": 0
+        }
+
+    def record_failure(self, doc, error):
+        self.failures.append((doc["_id"], error))
+        return self.terminal
+
+
+def _article(status=QUEUED, token=TOKEN, deliveries=0):
+    return {"_id": ObjectId(), STATUS_FIELD: status, VECTORIZATION_QUEUE_TOKEN_FIELD: token,
+            VECTORIZATION_DELIVERIES_FIELD: deliveries}
+
+
+@pytest.fixture
+def use_worker(monkeypatch):
+    def install(worker):
+        monkeypatch.setattr(celery_vectorization_task, "_worker", worker)
+        return worker
+    return install
+
+
+def test_tasks_run_eagerly():
+    assert vectorize_batch.app.conf.task_always_eager
+
+
+def test_only_documents_queued_under_the_token_are_processed(use_worker):
+    mine = _article()
+    requeued = _article(token="token-2")
+    completed = _article(status=VectorizationStatus.complete.value)
+    worker = use_worker(FakeWorker([mine, requeued, completed]))
+
+    result = vectorize_batch.delay([str(doc["_id"]) for doc in (mine, requeued, completed)], TOKEN).get()
+
+    assert worker.batches == [[mine["_id"]]]
+    assert result["processed"] == 1
+    assert result["dead_lettered"] == []
+    assert mine[VECTORIZATION_DELIVERIES_FIELD] == 1
+    assert requeued[VECTORIZATION_DELIVERIES_FIELD] == 0
+
+
+def test_exhausted_documents_are_dead_lettered(use_worker):
+    done, exhausted = _article(), _article()
+    worker = use_worker(FakeWorker([done, exhausted], result={
+        "processed": [done["_id"]], "failed": {exhausted["_id"]: "ValueError: bad text"},
+        "exhausted": [exhausted["_id"]], "deferred": [], "near_duplicates": 0
+    }))
+
+    result = vectorize_batch.delay([str(done["_id"]), str(exhausted["_id"])], TOKEN).get()
+
+    assert result["dead_lettered"] == [str(exhausted["_id"])]
+    assert result["failed"] == 1
+    dead_letters = worker.mongodb.collections[settings.DEAD_LETTER_COLLECTION]
+    assert [(item["article_id"], item["error"]) for item in dead_letters] == [
+        (str(exhausted["_id"]), "ValueError: bad text")
+    ]
+
+
+def test_exhausted_retries_return_documents_to_pending(use_worker):
+    articles = [_article(), _article()]
+    article_ids = [str(doc["_id"]) for doc in articles]
+    worker = use_worker(FakeWorker(articles, error=ConnectionError("mongo down")))
+
+    vectorize_batch.delay(article_ids, TOKEN)
+
+    assert len(worker.batches) == settings.CELERY_MAX_RETRIES + 1
+    assert [doc[STATUS_FIELD] for doc in articles] == [PENDING, PENDING]
+    # handled failures do not count as lost deliveries
+    assert [doc[VECTORIZATION_DELIVERIES_FIELD] for doc in articles] == [0, 0]
+    # documents are not blamed for a batch-level failure
+    assert worker.failures == []
+    dead_letters = worker.mongodb.collections[settings.DEAD_LETTER_COLLECTION]
+    assert len(dead_letters) == 1
+    assert dead_letters[0]["article_ids"] == article_ids
+    assert dead_letters[0]["error"] == "ConnectionError: mongo down"
+
+
+@pytest.mark.parametrize("terminal", [False, True])
+def test_lost_deliveries_are_charged_an_attempt(use_worker, terminal):
+    lost = _article(deliveries=settings.CELERY_MAX_DELIVERIES)
+    fresh = _article()
+    worker = use_worker(FakeWorker([lost, fresh], terminal=terminal))
+
+    result = vectorize_batch.delay([str(lost["_id"]), str(fresh["_id"])], TOKEN).get()
+
+    assert worker.batches == [[fresh["_id"]]]
+    assert [doc_id for doc_id, _ in worker.failures] == [lost["_id"]]
+    assert worker.corpus_stats.batches[0][1] == ([lost] if terminal else [])
+    assert result["dead_lettered"] == ([str(lost["_id"])] if terminal else [])
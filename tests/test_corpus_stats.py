@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db import corpus_stats
+from app.db.corpus_stats import UNKNOWN_DAY, CorpusStats
+
+
+class FakeMongo:
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.bulk_writes = []
+        self.pipelines = []
+
+    def bulk_update(self, collection, operations):
+        self.bulk_writes.append((collection, operations))
+        return len(operations)
+
+    def aggregate(self, collection, pipeline):
+        self.pipelines.append((collection, pipeline))
+        return iter(self.rows)
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    monkeypatch.setattr(corpus_stats, "UpdateOne", lambda query, update, upsert: (query, update, upsert))
+    instance = CorpusStats.__new__(CorpusStats)
+    instance.mongodb = FakeMongo()
+    instance.collection = "corpus_stats"
+    return instance
+
+
+def _increments(stats):
+    """The single bulk write of a call, as {counter id: $inc document}."""
+    assert len(stats.mongodb.bulk_writes) == 1
+    _, operations = stats.mongodb.bulk_writes[0]
+    assert all(upsert for _, _, upsert in operations)
+    return {query["_id"]: update["$inc"] for query, update, _ in operations}
+
+
+def test_days_buckets_by_utc_day_and_falls_back_to_unknown():
+    documents = [
+        {"publish_date": datetime(2024, 1, 2, 3, tzinfo=timezone(timedelta(hours=6)))},
+        {"publish_date": "2024-01-02T23:59:59"},
+        {"publish_date": None},
+        {},
+        {"publish_date": float("nan")},
+        {"publish_date": "yesterday"},
+    ]
+    assert CorpusStats._days(documents) == ["2024-01-01", "2024-01-02"] + [UNKNOWN_DAY] * 4
+
+
+def test_record_batch_splits_completed_and_failed_documents(stats):
+    encoded = {"domain": "a.com", "publish_date": "2024-01-02", "word_count": 100, "sentence_count": 5}
+    reprint = {"domain": "a.com", "publish_date": "2024-01-02T10:00:00", "word_count": 90, "sentence_count": 4}
+    failed = {"domain": "a.com", "word_count": 7}
+    other = {"publish_date": "2024-01-03", "word_count": None}
+
+    assert stats.record_batch([(encoded, 12.5), (reprint, None), (other, 3.0)], [failed]) == 3
+
+    assert _increments(stats) == {
+        "a.com:2024-01-02": {
+            "documents": 2, "words": 190, "sentences": 9, "vectorized": 2,
+            "near_duplicates": 1, "embedding_latency_ms": 12.5, "latency_samples": 1
+        },
+        "unknown:2024-01-03": {
+            "documents": 1, "words": 0, "sentences": 0, "vectorized": 1,
+            "embedding_latency_ms": 3.0, "latency_samples": 1
+        },
+        "a.com:unknown": {"documents": 1, "words": 7, "sentences": 0, "failed": 1},
+    }
+
+
+def test_record_batch_with_only_failed_documents(stats):
+    stats.record_batch([], [{"domain": "a.com", "publish_date": "2024-01-02"}])
+    assert _increments(stats) == {
+        "a.com:2024-01-02": {"documents": 1, "words": 0, "sentences": 0, "failed": 1}
+    }
+
+
+def test_record_batch_sets_domain_and_day_on_insert(stats):
+    stats.record_batch([({"domain": "a.com", "publish_date": "2024-01-02"}, 1.0)], [])
+    _, operations = stats.mongodb.bulk_writes[0]
+    assert operations[0][1]["$setOnInsert"] == {"domain": "a.com", "day": "2024-01-02"}
+
+
+def test_record_batch_without_documents_writes_nothing(stats):
+    assert stats.record_batch([], []) == 0
+    assert stats.mongodb.bulk_writes == []
+
+
+def test_remove_failed_decrements_what_record_batch_added(stats):
+    document = {"domain": "a.com", "publish_date": "2024-01-02", "word_count": 10, "sentence_count": 2}
+    stats.remove_failed([document, dict(document)])
+    assert _increments(stats) == {
+        "a.com:2024-01-02": {"documents": -2, "failed": -2, "words": -20, "sentences": -4}
+    }
+
+
+def _row(domain, vectorized, near_duplicates, latency_ms, samples):
+    return {
+        "_id": domain, "documents": vectorized + 1, "words": 10, "sentences": 2, "vectorized": vectorized,
+        "near_duplicates": near_duplicates, "failed": 1, "embedding_latency_ms": latency_ms, "latency_samples": samples
+    }
+
+
+def test_domain_totals_averages_latency_and_near_duplicate_rate(stats):
+    stats.mongodb.rows = [_row("a.com", 4, 1, 300.0, 3), _row("b.com", 0, 0, 0, 0)]
+
+    totals = stats.domain_totals()
+
+    assert totals["a.com"] == {
+        "documents": 5, "words": 10, "sentences": 2, "vectorized": 4, "near_duplicates": 1, "failed": 1,
+        "avg_embedding_latency_ms": 100.0, "near_duplicate_rate": 0.25
+    }
+    assert totals["b.com"]["avg_embedding_latency_ms"] is None
+    assert totals["b.com"]["near_duplicate_rate"] is None
+
+
+@pytest.mark.parametrize("start_day, end_day, expected_match", [
+    (None, None, {}),
+    ("2024-01-01", None, {"day": {"$ne": UNKNOWN_DAY, "$gte": "2024-01-01"}}),
+    ("2024-01-01", "2024-01-31", {"day": {"$ne": UNKNOWN_DAY, "$gte": "2024-01-01", "$lte": "2024-01-31"}}),
+])
+def test_domain_totals_filters_day_range(stats, start_day, end_day, expected_match):
+    stats.domain_totals(start_day, end_day)
+    collection, pipeline = stats.mongodb.pipelines[0]
+    assert collection == "corpus_stats"
+    assert pipeline[0] == {"$match": expected_match}
@@ -0,0 +1,78 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.core.metadata import build_chroma_metadata, convert_to_timestamp, to_epoch_seconds
+
+
+JAN_2 = 1704153600  # 2024-01-02T00:00:00Z
+JAN_2_10AM = JAN_2 + 10 * 60 * 60
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2024-01-02", JAN_2),
+    (" 2024-01-02 ", JAN_2),
+    ("2024-01-02T10:00:00", JAN_2_10AM),
+    ("2024-01-02 10:00:00", JAN_2_10AM),
+    ("2024-01-02T10:00:00Z", JAN_2_10AM),
+    ("2024-01-02T16:00:00+06:00", JAN_2_10AM),
+    (datetime(2024, 1, 2, 10), JAN_2_10AM),
+    (datetime(2024, 1, 2, 16, tzinfo=timezone(timedelta(hours=6))), JAN_2_10AM),
+    (date(2024, 1, 2), JAN_2),
+    (JAN_2, JAN_2),
+    (float(JAN_2), JAN_2),
+    (None, None),
+    ("", None),
+    ("garbage", None),
+    ("2024-13-45", None),
+    (True, None),
+    (float("nan"), None),
+    (float("inf"), None),
+    (float("-inf"), None),
+    (10 ** 20, None),
+    (-10 ** 20, None),
+    ([2024, 1, 2], None),
+    (b"2024-01-02", None),
+])
+def test_to_epoch_seconds_single_value(value, expected):
+    assert to_epoch_seconds([value]) == [expected]
+
+
+def test_to_epoch_seconds_keeps_order_when_one_value_is_bad():
+    values = ["2024-01-02", float("nan"), datetime(2024, 1, 2, 10), "2024-01-02T16:00:00+06:00", 10 ** 20]
+    assert to_epoch_seconds(values) == [JAN_2, None, JAN_2_10AM, JAN_2_10AM, None]
+
+
+def test_to_epoch_seconds_accepts_generators_and_empty_input():
+    assert to_epoch_seconds(value for value in ["2024-01-02"]) == [JAN_2]
+    assert to_epoch_seconds([]) == []
+
+
+def test_convert_to_timestamp_raises_value_error_on_bad_input():
+    assert convert_to_timestamp("2024-01-02") == JAN_2
+    with pytest.raises(ValueError):
+        convert_to_timestamp("not a date")
+
+
+def test_build_chroma_metadata_reports_errors_per_document():
+    documents = [
+        {"url": "https://a", "title": "A", "publish_date": datetime(2024, 1, 2, 10)},
+        {"title": "no url", "publish_date": "2024-01-02"},
+        {"url": "https://c", "publish_date": float("nan")},
+        {"url": "https://d", "publish_date": "yesterday"},
+        {"url": "https://e"},
+    ]
+
+    prepared = build_chroma_metadata(documents)
+
+    assert len(prepared) == len(documents)
+    assert prepared[0] == ({"title": "A", "url": "https://a", "publish_date": JAN_2_10AM}, None)
+    assert prepared[1] == (None, "missing url")
+    assert prepared[2][0] is None and "publish_date" in prepared[2][1]
+    assert prepared[3][0] is None and "publish_date" in prepared[3][1]
+
+    # a missing publish_date falls back to the current time and a default title
+    metadata, error = prepared[4]
+    assert error is None
+    assert metadata["title"] == "No Title"
+    assert abs(metadata["publish_date"] - datetime.now(timezone.utc).timestamp()) < 60
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from app.core.simhash import HASH_BITS, band_keys, hamming_distance, normalize_tokens, simhash
+
+
+def _article(seed: int, length: int = 400) -> str:
+    rng = random.Random(seed)
+    words = ["শব্দ%d" % i for i in range(2000)]
+    return " ".join(rng.choice(words) for _ in range(length))
+
+
+def test_normalize_tokens_keeps_bengali_words_and_drops_punctuation():
+    assert normalize_tokens("বাংলাদেশের রাজধানী ঢাকা। Hello, World!") == [
+        "বাংলাদেশের", "রাজধানী", "ঢাকা", "hello", "world"
+    ]
+
+
+def test_simhash_is_deterministic_and_64_bit():
+    fingerprint = simhash(_article(1))
+    assert fingerprint == simhash(_article(1))
+    assert 0 <= fingerprint < 2 ** HASH_BITS
+
+
+def test_simhash_ignores_case_and_punctuation():
+    text = _article(1)
+    assert simhash(text) == simhash(text.upper().replace(" ", " , "))
+
+
+def test_reprint_is_close_and_unrelated_article_is_far():
+    original = _article(1)
+    words = original.split()
+    words[50] = "নতুন"
+    reprint = " ".join(words) + " । সূত্র: বাসস"
+
+    assert hamming_distance(simhash(original), simhash(reprint)) <= 3
+    assert hamming_distance(simhash(original), simhash(_article(2))) > 10
+
+
+def test_simhash_skips_short_and_empty_texts():
+    assert simhash("only a few words here", min_tokens=30) is None
+    assert simhash("") is None
+    assert simhash(None) is None
+
+
+@pytest.mark.parametrize("max_distance", [1, 2, 3, 4, 6])
+def test_band_keys_cover_all_bits(max_distance):
+    keys = band_keys(2 ** HASH_BITS - 1, max_distance)
+    assert len(keys) == max_distance + 1
+    widths = [int(key.split(":")[1], 16).bit_length() for key in keys]
+    assert sum(widths) == HASH_BITS
+
+
+@pytest.mark.parametrize("flipped_bits", [(0,), (5, 40), (1, 20, 63), (15, 31, 47)])
+def test_fingerprints_within_max_distance_share_a_band(flipped_bits):
+    fingerprint = simhash(_article(3))
+    other = fingerprint
+    for bit in flipped_bits:
+        other ^= 1 << bit
+
+    assert hamming_distance(fingerprint, other) == len(flipped_bits)
+    assert set(band_keys(fingerprint, 3)) & set(band_keys(other, 3))
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.schemas import VectorizationStatus
+from app.tasks.vectorization_state import (
+    ATTEMPTS_FIELD, ERROR_FIELD, NEXT_ATTEMPT_FIELD, STATUS_FIELD, failure_update, pending_query, requeue_update,
+    retry_delay
+)
+
+
+NOW = datetime(2024, 1, 2, 10)
+
+
+def test_retry_delay_doubles_and_is_capped():
+    base = settings.VECTORIZATION_RETRY_BACKOFF
+    assert [retry_delay(attempts) for attempts in (1, 2, 3)] == [base, base * 2, base * 4]
+    assert retry_delay(100) == settings.VECTORIZATION_RETRY_BACKOFF_MAX
+
+
+@pytest.mark.parametrize("attempts", range(1, settings.VECTORIZATION_MAX_ATTEMPTS))
+def test_failure_update_returns_document_to_pending_with_backoff(attempts):
+    update = failure_update(attempts, "KeyError: 'url'", now=NOW)["$set"]
+
+    assert update[STATUS_FIELD] == VectorizationStatus.pending.value
+    assert update[ATTEMPTS_FIELD] == attempts
+    assert update[ERROR_FIELD] == "KeyError: 'url'"
+    assert update[NEXT_ATTEMPT_FIELD] == NOW + timedelta(seconds=retry_delay(attempts))
+
+
+def test_failure_update_parks_document_once_attempts_run_out():
+    update = failure_update(settings.VECTORIZATION_MAX_ATTEMPTS, "boom", now=NOW)["$set"]
+    assert update[STATUS_FIELD] == VectorizationStatus.failed.value
+    assert update[ERROR_FIELD] == "boom"
+
+
+def test_pending_query_respects_next_attempt_time():
+    query = pending_query(now=NOW)
+    assert {NEXT_ATTEMPT_FIELD: {"$lte": NOW}} in query["$and"][1]["$or"]
+
+
+def test_requeue_update_clears_attempt_history():
+    update = requeue_update()
+    assert update["$set"] == {STATUS_FIELD: VectorizationStatus.pending.value}
+    assert set(update["$unset"]) == {ATTEMPTS_FIELD, NEXT_ATTEMPT_FIELD, ERROR_FIELD}